@@ -0,0 +1,62 @@
+# Redis read-through cache (optional, only active when REDIS_URL is set)
+
+import os
+import orjson
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+redis = None
+
+async def init():
+
+    global redis
+
+    if aioredis and REDIS_URL:
+        redis = aioredis.from_url(REDIS_URL)
+
+async def close():
+
+    global redis
+
+    if redis:
+        await redis.aclose()
+        redis = None
+
+# cache is best-effort: a dead redis should never take down a request
+
+async def get_json(key):
+
+    if not redis:
+        return None
+
+    try:
+        val = await redis.get(key)
+    except Exception:
+        return None
+
+    return orjson.loads(val) if val else None
+
+async def set_json(key, value, ttl=300):
+
+    if not redis:
+        return
+
+    try:
+        await redis.set(key, orjson.dumps(value), ex=ttl)
+    except Exception:
+        pass
+
+async def delete(*keys):
+
+    if not redis or not keys:
+        return
+
+    try:
+        await redis.delete(*keys)
+    except Exception:
+        pass
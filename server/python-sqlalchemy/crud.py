@@ -1,107 +1,217 @@
-from sqlalchemy.orm import Session
-from .models import User, Ticket
-from .schemas import UserCreate
-from fastapi import HTTPException
-from . import schemas
-from datetime import datetime, timezone
-
-def create_user(db: Session, user: UserCreate):
-    
-    existing = db.query(User).filter(User.email == user.email).first()
-    
-    if existing: 
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    db_user = User(email=user.email, full_name=user.full_name, password=user.password)
-    
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-     
-    return db_user
-
-
-def get_users(db: Session):
-    
-    return db.query(User).all()
-
-
-def get_user_by_id(db: Session, user_id: int):
-    
-    return db.query(User).filter(User.id == user_id).first()
-
-
-def get_user_by_email(db: Session, user_email: str):
-    
-    return db.query(User).filter(User.email == user_email).first()
-
-
-def delete_user_by_id(db: Session, user_id: int):
-    
-    user = db.query(User).filter(User.id == user_id).first()
-    
-    if not user:
-        return None
-     
-    db.delete(user)
-    db.commit()
-    
-    return user
-
-def delete_user_by_email(db: Session, user_email: str):
-    
-    user = db.query(User).filter(User.email == user_email).first()
-    
-    if not user:
-        return None
-     
-    db.delete(user)
-    db.commit()
-    
-    return user
-
-def authenticate_user(db: Session, email: str, password: str):
-    
-    user = db.query(User).filter(User.email == email).first()
-    
-    if not user or user.password != password:
-        return None
-    
-    return user
-
-
-def create_ticket(db: Session, ticket: schemas.TicketCreate):
-    
-    new_ticket = Ticket(**ticket.dict(), date_created=datetime.now(timezone.utc))
-    
-    db.add(new_ticket)
-    db.commit()
-    db.refresh(new_ticket)
-    
-    return new_ticket
-
-def get_ticket_by_id(db: Session, ticket_id: int):
-     
-    return db.query(Ticket).filter(Ticket.id == ticket_id).first()
-
-def get_tickets_by_user_field(db: Session, field: str, user_id: int):
-    
-    return db.query(Ticket).filter(getattr(Ticket, field) == user_id).all()
-
-def update_ticket(db: Session, ticket_id: int, updates: schemas.TicketUpdate):
-    
-    # find ticket by id
-    ticket = db.query(Ticket).filter(Ticket.id == ticket.id).first()
-    
-    if not ticket:
-        return None
-    
-    # Loop through update fields, skip unset ones
-    for key, value in updates.model_dump(exclude_unset=True).items():
-        setattr(ticket, key, value)
-        
-    ticket.date_updated = datetime.now(timezone.utc)
-    db.commit() # save changes
-    db.refresh(ticket)  # reload from db
-    
-    return ticket
\ No newline at end of file
+from sqlalchemy import select, update, func, bindparam, Integer, lambda_stmt
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, joinedload
+from .models import User, Ticket
+from .schemas import UserCreate
+from fastapi import HTTPException
+from . import schemas
+from datetime import datetime, timezone
+from passlib.context import CryptContext
+from passlib.exc import UnknownHashError
+import anyio.to_thread
+import json
+
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+# the only ticket fields where an explicit null is a meaningful value
+NULLABLE_TICKET_FIELDS = {"notes", "date_resolved", "due_date"}
+
+async def create_user(db: AsyncSession, user: UserCreate):
+
+    # argon2 burns ~150ms of CPU per hash — run it on a worker thread so
+    # it doesn't stall every other request on the event loop
+    hashed = await anyio.to_thread.run_sync(pwd_context.hash, user.password)
+
+    # one atomic INSERT ... ON CONFLICT DO NOTHING RETURNING — the unique
+    # index on email does the duplicate check, no pre-SELECT or refresh
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+
+    stmt = (
+        insert(User)
+        .values(email=user.email, full_name=user.full_name, password=hashed)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(User)
+    )
+
+    result = await db.execute(stmt)
+    db_user = result.scalar_one_or_none()
+    await db.commit()
+
+    if db_user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    return db_user
+
+
+async def get_users(db: AsyncSession):
+
+    result = await db.execute(select(User))
+
+    return result.scalars().all()
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int):
+
+    # lambda statement: the expression tree is built and compiled once,
+    # later calls only swap the bound id
+    stmt = lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+    result = await db.execute(stmt)
+
+    return result.scalar_one_or_none()
+
+
+async def get_user_by_email(db: AsyncSession, user_email: str):
+
+    stmt = lambda_stmt(lambda: select(User).where(User.email == user_email))
+
+    result = await db.execute(stmt)
+
+    return result.scalar_one_or_none()
+
+
+async def get_users_by_ids(db: AsyncSession, ids):
+
+    if not ids:
+        return []
+
+    # one array/json parameter instead of a variable-length IN (?, ?, ...)
+    # list, so the statement text stays the same no matter how many ids
+    if db.bind.dialect.name == "postgresql":
+        stmt = select(User).where(User.id == func.any(bindparam("ids", list(ids), type_=ARRAY(Integer))))
+    else:
+        each = func.json_each(bindparam("ids", json.dumps(list(ids)))).table_valued("value")
+        stmt = select(User).where(User.id.in_(select(each.c.value)))
+
+    result = await db.execute(stmt)
+
+    return result.scalars().all()
+
+
+async def delete_user_by_id(db: AsyncSession, user_id: int):
+
+    user = await get_user_by_id(db, user_id)
+
+    if not user:
+        return None
+
+    await db.delete(user)
+    await db.commit()
+
+    return user
+
+async def delete_user_by_email(db: AsyncSession, user_email: str):
+
+    user = await get_user_by_email(db, user_email)
+
+    if not user:
+        return None
+
+    await db.delete(user)
+    await db.commit()
+
+    return user
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+
+    user = await get_user_by_email(db, email)
+
+    if not user:
+        return None
+
+    # verify() is constant-time, unlike a plain string compare; rows that
+    # predate hashing hold plaintext, which should fail auth, not crash.
+    # offloaded to a worker thread like hash() — it costs the same CPU
+    try:
+        if not await anyio.to_thread.run_sync(pwd_context.verify, password, user.password):
+            return None
+    except UnknownHashError:
+        return None
+
+    return user
+
+
+async def create_ticket(db: AsyncSession, ticket: schemas.TicketCreate):
+
+    new_ticket = Ticket(**ticket.model_dump(), date_created=datetime.now(timezone.utc))
+
+    db.add(new_ticket)
+    await db.commit()
+    await db.refresh(new_ticket)
+
+    return new_ticket
+
+async def get_ticket_by_id(db: AsyncSession, ticket_id: int):
+
+    # joinedload since it's a single row anyway
+    stmt = (
+        select(Ticket)
+        .where(Ticket.id == ticket_id)
+        .options(joinedload(Ticket.creator), joinedload(Ticket.assignee), joinedload(Ticket.assigner))
+    )
+
+    result = await db.execute(stmt)
+
+    return result.scalar_one_or_none()
+
+async def get_tickets(
+    db: AsyncSession,
+    status: str = None,
+    created_by: int = None,
+    assigned_to: int = None,
+    assigned_by: int = None,
+    limit: int = 10,
+    after_id: int = None,
+):
+
+    # one filtered + keyset-paginated query path for every ticket listing,
+    # selectinload batches the related users into one IN query per
+    # relationship instead of one query per ticket (N+1)
+    stmt = select(Ticket).options(
+        selectinload(Ticket.creator), selectinload(Ticket.assignee), selectinload(Ticket.assigner)
+    )
+
+    if status:
+        stmt = stmt.where(Ticket.status == status)
+    if created_by:
+        stmt = stmt.where(Ticket.created_by == created_by)
+    if assigned_to:
+        stmt = stmt.where(Ticket.assigned_to == assigned_to)
+    if assigned_by:
+        stmt = stmt.where(Ticket.assigned_by == assigned_by)
+
+    # newest first, pass the last id you saw as after_id for the next page
+    if after_id:
+        stmt = stmt.where(Ticket.id < after_id)
+
+    result = await db.execute(stmt.order_by(Ticket.id.desc()).limit(limit))
+
+    return result.scalars().all()
+
+async def update_ticket(db: AsyncSession, ticket_id: int, updates: schemas.TicketUpdate):
+
+    # one UPDATE ... RETURNING instead of select-then-update
+    # (unset fields are skipped, so users only update what they send;
+    # explicit nulls are dropped for required columns so a
+    # {"title": null} body can't poison a row that reads expect whole)
+    values = {
+        key: value
+        for key, value in updates.model_dump(exclude_unset=True).items()
+        if value is not None or key in NULLABLE_TICKET_FIELDS
+    }
+
+    stmt = (
+        update(Ticket)
+        .where(Ticket.id == ticket_id)
+        .values(**values, date_updated=datetime.now(timezone.utc))
+        .returning(Ticket)
+    )
+
+    result = await db.execute(stmt)
+    ticket = result.scalar_one_or_none()
+
+    await db.commit()
+
+    return ticket
@@ -1,16 +1,30 @@
-# DB setup
-
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-
-SQLALCHEMY_DATABASE_URL = "sqlite:///.users.db"
-
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
-
-SessionLocal = sessionmaker(bind=engine)
-Base = declarative_base()
-
+# DB setup
+
+import asyncio
+import os
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, async_scoped_session
+from sqlalchemy.orm import declarative_base
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///.users.db")
+
+# pool sizing only matters for a real db server (sqlite ignores it)
+# overridable per deployment; keep these small per worker if running
+# many uvicorn workers behind pgbouncer, since every worker gets its own pool
+engine_kwargs = {"pool_pre_ping": True}
+
+if not SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    engine_kwargs.update(
+        pool_size=int(os.getenv("SQLALCHEMY_POOL_SIZE", 20)),
+        max_overflow=int(os.getenv("SQLALCHEMY_MAX_OVERFLOW", 20)),
+        pool_timeout=30,
+        pool_recycle=1800,  # drop connections idle long enough to be killed server-side
+    )
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_kwargs)
+
+# scoped to the current task — each request is one task, so the same
+# session is reused anywhere inside a request and removed at the end
+session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+SessionLocal = async_scoped_session(session_factory, scopefunc=asyncio.current_task)
+Base = declarative_base()
@@ -0,0 +1,35 @@
+# One-shot schema setup
+
+# Run this once before starting the app (e.g. as a pre-start container
+# command) instead of letting every worker issue DDL at boot:
+#
+#     python init_db.py   (from this directory)
+#
+# For real schema changes on prod, alembic migrations are the way to go;
+# create_all only adds missing tables/indexes and never alters existing ones.
+
+import asyncio
+import os
+import sys
+
+if __package__ in (None, ""):
+    # run directly as a script: the relative imports below need a package
+    # context, so put the parent dir on sys.path and adopt this directory
+    # as our package (importlib doesn't mind the dash in the name even
+    # though the import statement would)
+    _here = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(_here))
+    __package__ = os.path.basename(_here)
+
+from .db import Base, engine
+from . import models  # noqa: F401  (registers the tables on Base)
+
+async def main():
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,178 +1,257 @@
-# Entry point
-
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from .db import Base, engine, SessionLocal
-from . import crud, schemas
-from .models import Ticket
-from typing import Optional, List
-import os
-
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
-
-@app.get("/")
-def serve_index():
-    filepath = os.path.join(os.path.dirname(__file__), "static", "index.html")
-    return FileResponse(filepath)
-
-origins = [
-    "http://localhost:5500",
-    "http://127.0.0.1:5500",
-    "http://127.0.0.1:8000",
-    "http://localhost:8000",
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins = ["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"]
-)
-
-def get_db():
-    
-    db = SessionLocal()
-    
-    try:
-        yield db
-    finally:
-        db.close()
-        
-
-@app.post("/users", response_model=schemas.UserOut)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    
-    return crud.create_user(db, user)
-
-
-@app.get("/users")
-def get_users(db: Session = Depends(get_db)):
-    
-    return crud.get_users(db)
-
-
-@app.get("/users/id/{user_id}")
-def get_user_by_id(user_id: str, db: Session = Depends(get_db)):
-    
-    user = crud.get_user_by_id(db, user_id)
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
-
-# get user by email
-@app.get("/users/email/{user_email}")
-def get_user_by_email(user_email: str, db: Session = Depends(get_db)):
-    
-    user = crud.get_user_by_email(db, user_email)
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
-
-#delete user by id
-@app.delete("/users/id/{user_id}")
-def delete_user_by_id(user_id: str, db: Session = Depends(get_db)):
-    
-    deleted_user = crud.delete_user_by_id(db, user_id)
-    
-    if not deleted_user: 
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return { "detail": "User deleted" }
-
-# delete user by email
-@app.delete("/users/email/{user_email}")
-def delete_user_by_email(user_email: str, db: Session = Depends(get_db)):
-    
-    deleted_user = crud.delete_user_by_email(db, user_email)
-    
-    if not deleted_user: 
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    return { "detail": "User deleted" }
-
-# login
-@app.post("/login")
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
-    
-    auth_user = crud.authenticate_user(db, user.email, user.password)
-    
-    if not auth_user:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    return {"message" : "Login successful", "user_id": auth_user.id}
-
-
-# create ticket
-@app.post("/tickets", response_model=schemas.TicketOut)
-def create_ticket(ticket: schemas.TicketCreate, db: Session = Depends(get_db)):
-    
-    return crud.create_ticket(db, ticket)
-
-
-# get ticket by id
-@app.get("/tickets/{ticket_id}", response_model=schemas.TicketOut)
-def get_ticket(ticket_id: int, db: Session = Depends(get_db)):
-    
-    ticket = crud.get_ticket_by_id(db, ticket_id)
-    
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket not found")
-    
-    return ticket
-
-
-# Filter and paginate tickets
-@app.get("/tickets", response_model=List[schemas.TicketOut])
-def get_tickets(
-    status: Optional[str] = None,
-    created_by: Optional[int] = None,
-    assigned_to: Optional[int] = None,
-    assigned_by: Optional[int] = None,
-    limit: int = 10,    # Max number of results to return
-    offset: int = 0,    # How many to skip (for pagination)
-    db: Session = Depends(get_db)
-):
-    
-    query = db.query(Ticket)    # Start with all tickets
-    
-    # Apply filters if provided
-    if status:
-        query = query.filter(Ticket.status == status)
-    if created_by:
-        query = query.filter(Ticket.created_by == created_by)
-    if assigned_to:
-        query = query.filter(Ticket.assigned_to == assigned_to)
-    if assigned_by:
-        query = query.filter(Ticket.assigned_by == assigned_by)
-        
-    # Apply pagination and return result
-    return query.offset(offset).limit(limit).all()
-
-        
-@app.get("/tickets/user/{field}/{user_id}")
-def get_tickets_by_user(field: str, user_id: int, db: Session = Depends(get_db)):
-    
-    if field not in { "created_by", "assigned_to", "assigned_by"}:
-        raise HTTPException(status_code=400, detail="Invalid field")
-    
-    return crud.get_tickets_by_user_field(db, field, user_id)
-
-
-@app.put("/tickets/{ticket_id}", response_model=schemas.TicketOut)
-def update_ticket(ticket_id: int, updates: schemas.TicketUpdate, db: Session = Depends(get_db)):
-    
-    ticket = crud.update_ticket(db, ticket_id, updates)
-    
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket not found")
-    
-    return ticket
\ No newline at end of file
+# Entry point
+
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .db import SessionLocal
+from . import cache, crud, schemas
+from .models import User
+from typing import Optional, List
+from pydantic import TypeAdapter
+import orjson
+import os
+
+# built once at import so the list validator isn't reconstructed per request
+ticket_list_adapter = TypeAdapter(List[schemas.TicketOut])
+
+# orjson serializes much faster than stdlib json, especially the
+# datetime-heavy ticket lists
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# schema setup lives in init_db.py now — run it once before starting
+# workers instead of having every worker issue DDL at boot
+
+@app.on_event("startup")
+async def startup():
+    await cache.init()
+
+@app.on_event("shutdown")
+async def close_cache():
+    await cache.close()
+
+@app.get("/")
+def serve_index():
+    filepath = os.path.join(os.path.dirname(__file__), "static", "index.html")
+    return FileResponse(filepath)
+
+origins = [
+    "http://localhost:5500",
+    "http://127.0.0.1:5500",
+    "http://127.0.0.1:8000",
+    "http://localhost:8000",
+]
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins = ["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"]
+)
+
+async def get_db():
+
+    try:
+        yield SessionLocal()
+    finally:
+        # closes the task-local session and returns its connection to the pool
+        await SessionLocal.remove()
+
+
+@app.post("/users", response_model=schemas.UserOut)
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+
+    return await crud.create_user(db, user)
+
+
+@app.get("/users", response_model=List[schemas.UserOut])
+async def get_users(stream: bool = False, db: AsyncSession = Depends(get_db)):
+
+    if not stream:
+        return await crud.get_users(db)
+
+    # ?stream=1 sends NDJSON, one user per line, as rows arrive from the
+    # db instead of materializing the whole table first
+    async def rows():
+
+        result = await db.stream(select(User).execution_options(yield_per=500))
+
+        async for user in result.scalars():
+            yield orjson.dumps(schemas.UserOut.model_validate(user).model_dump()) + b"\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+
+@app.get("/users/id/{user_id}")
+async def get_user_by_id(user_id: str, db: AsyncSession = Depends(get_db)):
+
+    key = f"user:id:{user_id}"
+    cached = await cache.get_json(key)
+
+    if cached is not None:
+        return cached
+
+    user = await crud.get_user_by_id(db, user_id)
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    data = schemas.UserOut.model_validate(user).model_dump()
+    await cache.set_json(key, data)
+
+    return data
+
+# get user by email
+@app.get("/users/email/{user_email}")
+async def get_user_by_email(user_email: str, db: AsyncSession = Depends(get_db)):
+
+    key = f"user:email:{user_email}"
+    cached = await cache.get_json(key)
+
+    if cached is not None:
+        return cached
+
+    user = await crud.get_user_by_email(db, user_email)
+
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    data = schemas.UserOut.model_validate(user).model_dump()
+    await cache.set_json(key, data)
+
+    return data
+
+#delete user by id
+@app.delete("/users/id/{user_id}")
+async def delete_user_by_id(user_id: str, db: AsyncSession = Depends(get_db)):
+
+    deleted_user = await crud.delete_user_by_id(db, user_id)
+
+    if not deleted_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await cache.delete(f"user:id:{deleted_user.id}", f"user:email:{deleted_user.email}")
+
+    return { "detail": "User deleted" }
+
+# delete user by email
+@app.delete("/users/email/{user_email}")
+async def delete_user_by_email(user_email: str, db: AsyncSession = Depends(get_db)):
+
+    deleted_user = await crud.delete_user_by_email(db, user_email)
+
+    if not deleted_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    await cache.delete(f"user:id:{deleted_user.id}", f"user:email:{deleted_user.email}")
+
+    return { "detail": "User deleted" }
+
+# login
+@app.post("/login")
+async def login(user: schemas.UserLogin, db: AsyncSession = Depends(get_db)):
+
+    auth_user = await crud.authenticate_user(db, user.email, user.password)
+
+    if not auth_user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    return {"message" : "Login successful", "user_id": auth_user.id}
+
+
+# create ticket
+@app.post("/tickets", response_model=schemas.TicketOut)
+async def create_ticket(ticket: schemas.TicketCreate, db: AsyncSession = Depends(get_db)):
+
+    return await crud.create_ticket(db, ticket)
+
+
+# get ticket by id
+@app.get("/tickets/{ticket_id}", response_model=schemas.TicketOut)
+async def get_ticket(ticket_id: int, db: AsyncSession = Depends(get_db)):
+
+    key = f"ticket:{ticket_id}"
+    cached = await cache.get_json(key)
+
+    if cached is not None:
+        return cached
+
+    ticket = await crud.get_ticket_by_id(db, ticket_id)
+
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    await cache.set_json(key, schemas.TicketOut.model_validate(ticket).model_dump())
+
+    return ticket
+
+
+# Filter and paginate tickets
+# no response_model here: the module-level TypeAdapter below already
+# validates and serializes the rows, a response_model would redo both
+@app.get("/tickets")
+async def get_tickets(
+    status: Optional[str] = None,
+    created_by: Optional[int] = None,
+    assigned_to: Optional[int] = None,
+    assigned_by: Optional[int] = None,
+    limit: int = 10,    # Max number of results to return
+    after_id: Optional[int] = None,    # Last ticket id of the previous page (keyset pagination)
+    db: AsyncSession = Depends(get_db)
+):
+
+    # short TTL instead of precise invalidation for the list keys
+    key = f"tickets:{status}:{created_by}:{assigned_to}:{assigned_by}:{limit}:{after_id}"
+    cached = await cache.get_json(key)
+
+    if cached is not None:
+        return cached
+
+    tickets = await crud.get_tickets(
+        db,
+        status=status,
+        created_by=created_by,
+        assigned_to=assigned_to,
+        assigned_by=assigned_by,
+        limit=limit,
+        after_id=after_id,
+    )
+
+    data = ticket_list_adapter.dump_python(
+        ticket_list_adapter.validate_python(tickets, from_attributes=True)
+    )
+    await cache.set_json(key, data, ttl=60)
+
+    return data
+
+
+@app.get("/tickets/user/{field}/{user_id}", response_model=List[schemas.TicketOut])
+async def get_tickets_by_user(
+    field: str,
+    user_id: int,
+    limit: int = 10,
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+
+    if field not in { "created_by", "assigned_to", "assigned_by"}:
+        raise HTTPException(status_code=400, detail="Invalid field")
+
+    # same paginated query path as /tickets, so the composite indexes and
+    # eager loading apply here too
+    return await crud.get_tickets(db, limit=limit, after_id=after_id, **{field: user_id})
+
+
+@app.put("/tickets/{ticket_id}", response_model=schemas.TicketOut)
+async def update_ticket(ticket_id: int, updates: schemas.TicketUpdate, db: AsyncSession = Depends(get_db)):
+
+    ticket = await crud.update_ticket(db, ticket_id, updates)
+
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    await cache.delete(f"ticket:{ticket_id}")
+
+    return ticket
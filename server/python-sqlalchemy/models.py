@@ -1,6 +1,6 @@
 # SQLAlchemy models
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from .db import Base
 from datetime import datetime
 from sqlalchemy.orm import relationship
@@ -13,26 +13,34 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
     full_name = Column(String)
-    password = Column(String)   # plain-text for now (not safe, but should be fine for testing and dev)
+    password = Column(String)   # argon2 hash, never plain-text
     
     
 class Ticket(Base):
     
     __tablename__ = "tickets"
-    
+
+    # composite indexes for the common /tickets filter combos
+    # (user column first since it's more selective than status)
+    __table_args__ = (
+        Index("ix_tickets_created_by_status", "created_by", "status"),
+        Index("ix_tickets_assigned_to_status", "assigned_to", "status"),
+        Index("ix_tickets_assigned_by_status", "assigned_by", "status"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String)
     fault_description = Column(String)
     location = Column(String)
-    date_created = Column(DateTime, default=datetime.utcnow)
+    date_created = Column(DateTime, default=datetime.utcnow, index=True)
     date_updated = Column(DateTime)
     date_resolved = Column(DateTime)
     priority = Column(String)
-    status = Column(String)
+    status = Column(String, index=True)
     type = Column(String)
-    created_by = Column(String, ForeignKey("users.id"))
-    assigned_by = Column(String, ForeignKey("users.id"))
-    assigned_to = Column(String, ForeignKey("users.id"))
+    created_by = Column(Integer, ForeignKey("users.id"), index=True)
+    assigned_by = Column(Integer, ForeignKey("users.id"), index=True)
+    assigned_to = Column(Integer, ForeignKey("users.id"), index=True)
     due_date = Column(DateTime)
     notes = Column(String)
     
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 
@@ -7,8 +7,12 @@ class UserCreate(BaseModel):
     full_name: str
     password: str
     
-class UserOut(UserCreate):
+class UserOut(BaseModel):
+    # no password field — the stored hash never leaves the server
+    id: int
     email: str
+    full_name: str
+    model_config = ConfigDict(from_attributes=True)
     
 class UserLogin(BaseModel):
     email: str
@@ -30,20 +34,22 @@ class TicketCreate(BaseModel):
 class TicketOut(TicketCreate):
     id: int
     date_created: datetime
-    class Config:
-        orm_mode = True
+    due_date: Optional[datetime] = None   # clearable via PUT, unlike the create path
+    model_config = ConfigDict(from_attributes=True)
         
 class TicketUpdate(BaseModel):
     # All fields are optional so user can update only what they want
-    title: Optional[str]
-    fault_description: Optional[str]
-    location: Optional[str]
-    priority: Optional[str]
-    status: Optional[str]
-    type: Optional[str]
-    created_by: Optional[int]
-    assigned_to: Optional[int]
-    assigned_by: Optional[int]
-    due_date: Optional[datetime]
-    date_resolved: Optional[datetime]
+    # (the = None defaults matter: without them pydantic v2 treats the
+    # fields as required and partial updates 422)
+    title: Optional[str] = None
+    fault_description: Optional[str] = None
+    location: Optional[str] = None
+    priority: Optional[str] = None
+    status: Optional[str] = None
+    type: Optional[str] = None
+    created_by: Optional[int] = None
+    assigned_to: Optional[int] = None
+    assigned_by: Optional[int] = None
+    due_date: Optional[datetime] = None
+    date_resolved: Optional[datetime] = None
     notes: Optional[str] = None
\ No newline at end of file